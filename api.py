@@ -6,11 +6,14 @@ Replicate API integration for Dream Background Remover plugin
 Handles communication with Replicate's background removal API
 """
 
-import os
-import tempfile
-from typing import Optional, Callable, Tuple
+import base64
+import io
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Callable, Tuple
 
-from gi.repository import GdkPixbuf, Gimp
+from gi.repository import GdkPixbuf
 
 from i18n import _
 
@@ -20,15 +23,92 @@ PROGRESS_PROCESS = 0.7
 PROGRESS_DOWNLOAD = 0.9
 PROGRESS_COMPLETE = 1.0
 
+KEEPALIVE_CONNECTIONS = 4
+KEEPALIVE_EXPIRY = 60
+WARM_UP_TIMEOUT = 5
+DOWNLOAD_CONNECT_TIMEOUT = 5.0
+DOWNLOAD_READ_TIMEOUT = 30.0
+MODEL_NAME_PATTERN = re.compile(
+    r"^[A-Za-z0-9._-]+/[A-Za-z0-9._-]+(:[a-f0-9]{40,64})?$"
+)
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+RESULT_CHUNK_SIZE = 64 * 1024
+POLL_INTERVAL_INITIAL = 0.1
+POLL_INTERVAL_MAX = 0.5
+POLL_BACKOFF = 1.5
+PREDICTION_FINISHED_STATUSES = ("succeeded", "failed", "canceled")
+
+MSG_PREPARING = _("Preparing image for upload...")
+MSG_UPLOADING = _("Uploading image to Replicate...")
+MSG_PROCESSING = _("Processing image...")
+MSG_DOWNLOADING = _("Downloading result...")
+MSG_COMPLETE = _("Background removal complete!")
+MSG_CANCELLED = _("Operation cancelled")
+
 try:
+    import httpx
     from replicate.client import Client
-    from replicate.exceptions import ModelError, ReplicateError
+    from replicate.exceptions import ReplicateError
     REPLICATE_AVAILABLE = True
 except ImportError:
     REPLICATE_AVAILABLE = False
     print("Warning: replicate package not installed. "
           "Run: pip install replicate")
 
+_CLIENT_CACHE: Dict[str, Tuple["Client", "httpx.Client"]] = {}
+
+
+def _get_clients(api_key: str) -> Tuple["Client", "httpx.Client"]:
+    """
+    Get the shared Replicate and download clients for the given API key
+
+    Clients are kept for the lifetime of the plugin process so that
+    their keep-alive connections to Replicate are reused across runs.
+    Both clients share one transport, so result downloads reuse the
+    connections opened for the API calls.
+
+    Args:
+        api_key (str): Replicate API key
+
+    Returns:
+        tuple: (Client, httpx.Client) cached for the API key
+    """
+    clients = _CLIENT_CACHE.get(api_key)
+    if clients is None:
+        transport = httpx.HTTPTransport(limits=httpx.Limits(
+            max_keepalive_connections=KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY
+        ))
+        download_client = httpx.Client(
+            transport=transport,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=httpx.Timeout(DOWNLOAD_CONNECT_TIMEOUT,
+                                  read=DOWNLOAD_READ_TIMEOUT),
+            follow_redirects=True
+        )
+        clients = _CLIENT_CACHE.setdefault(api_key, (
+            Client(api_token=api_key, transport=transport),
+            download_client
+        ))
+    return clients
+
+
+def _continue_without_progress(_message: str,
+                               _percentage: Optional[float] = None) -> bool:
+    """Progress callback used when the caller does not supply one"""
+    return True
+
+
+def _check_model_name(model_name: str) -> Optional[str]:
+    """Get an error message if the model identifier is malformed"""
+    if not model_name:
+        return _("No model specified")
+
+    if not MODEL_NAME_PATTERN.match(model_name):
+        return _("Invalid model identifier")
+
+    return None
+
 
 class ReplicateAPI:
     """Handles Replicate API communication for background removal"""
@@ -50,142 +130,295 @@ class ReplicateAPI:
             raise ValueError(_("API key is required"))
 
         self.api_key = api_key.strip()
-        self.client = Client(api_token=self.api_key)
+        self.client, self.download_client = _get_clients(self.api_key)
 
-    def remove_background(
+    def remove_background_from_bytes(
         self,
-        drawable: Gimp.Drawable,
+        image_bytes: bytes,
         model_name: str,
         progress_callback: Optional[Callable[
             [str, Optional[float]], bool
-        ]] = None
+        ]] = None,
+        cancel_event: Optional[threading.Event] = None
     ) -> Tuple[Optional[GdkPixbuf.Pixbuf], Optional[str]]:
         """
-        Remove background from a GIMP drawable using Replicate API
+        Remove background from already exported PNG data
+
+        Meant to be called from a worker thread: the upload, the wait for
+        the prediction and the PNG decode all happen on the calling thread.
+        Export the drawable on the GIMP main thread first, since PDB calls
+        must not be made from other threads.
 
         Args:
-            drawable (Gimp.Drawable): GIMP drawable to process
+            image_bytes (bytes): PNG image data to process
             model_name (str): The Replicate model identifier
                 (e.g., "bria/remove-background")
             progress_callback (callable, optional): Progress callback function.
                 Called with (message: str, percentage: float | None).
                 Should return True to continue, False to cancel.
+            cancel_event (threading.Event, optional): Event that is set to
+                cancel. Waits between status polls return as soon as it is
+                set, and the prediction is cancelled on Replicate.
 
         Returns:
             tuple: (GdkPixbuf.Pixbuf | None, str | None)
                 - If successful: (pixbuf, None)
                 - If failed: (None, error_message)
                 - If cancelled: (None, "Operation cancelled")
+        """
+        if not image_bytes:
+            return None, _("Failed to export image data")
+
+        error = _check_model_name(model_name)
+        if error:
+            return None, error
+
+        report = progress_callback or _continue_without_progress
+        return self._remove_background_from_bytes(
+            image_bytes, model_name, report, cancel_event)
+
+    def start_warm_up(self) -> threading.Thread:
+        """
+        Start opening a keep-alive connection to Replicate
+
+        Call before exporting the image so the TLS handshake overlaps the
+        PNG encode.
 
-        Raises:
-            ImportError: If replicate package is not available
-            ValueError: If API key is invalid
+        Returns:
+            threading.Thread: The daemon thread doing the warm-up
         """
-        if not drawable:
-            return None, _("No drawable provided")
+        warm_up = threading.Thread(target=self._warm_up_connection)
+        warm_up.daemon = True
+        warm_up.start()
+        return warm_up
 
-        if not model_name:
-            return None, _("No model specified")
+    def _remove_background_from_bytes(
+        self,
+        image_bytes: bytes,
+        model_name: str,
+        report: Callable[[str, Optional[float]], bool],
+        cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[Optional[GdkPixbuf.Pixbuf], Optional[str]]:
+        """
+        Upload exported image data and decode the returned result
 
-        temp_path = None
+        Args:
+            image_bytes (bytes): PNG image data to process
+            model_name (str): The Replicate model identifier
+            report (callable): Progress callback, see
+                remove_background_from_bytes
+            cancel_event (threading.Event, optional): Cancellation event,
+                see remove_background_from_bytes
 
+        Returns:
+            tuple: (GdkPixbuf.Pixbuf | None, str | None)
+        """
         try:
-            if progress_callback and not progress_callback(
-                _("Preparing image for upload..."), PROGRESS_PREPARE
-            ):
-                return None, _("Operation cancelled")
-
-            from integrator import export_drawable_to_bytes
-
-            image_bytes = export_drawable_to_bytes(drawable)
-            if not image_bytes:
-                return None, _("Failed to export image data")
-
-            with tempfile.NamedTemporaryFile(
-                suffix='.png', delete=False
-            ) as temp_file:
-                temp_path = temp_file.name
-                temp_file.write(image_bytes)
-
-            if progress_callback and not progress_callback(
-                _("Uploading image to Replicate..."), PROGRESS_UPLOAD
-            ):
-                return None, _("Operation cancelled")
-
-            with open(temp_path, 'rb') as image_file:
-                try:
-                    output = self.client.run(
-                        model_name,
-                        input={"image": image_file}
-                    )
-
-                    if progress_callback and not progress_callback(
-                        _("Processing image..."), PROGRESS_PROCESS
-                    ):
-                        return None, _("Operation cancelled")
-
-                    if not output:
-                        return None, _("No output received from API")
-
-                    if progress_callback and not progress_callback(
-                        _("Downloading result..."), PROGRESS_DOWNLOAD
-                    ):
-                        return None, _("Operation cancelled")
-
-                    result_bytes = b''.join(chunk for chunk in output)
-
-                    if not result_bytes:
-                        return None, _("No image data in API response")
-
-                    pixbuf = self._bytes_to_pixbuf(result_bytes)
-                    if not pixbuf:
-                        return None, _("Failed to convert result to image")
-
-                    if progress_callback:
-                        progress_callback(
-                            _("Background removal complete!"),
-                            PROGRESS_COMPLETE
-                        )
-
-                    return pixbuf, None
-
-                except ModelError as e:
-                    error_msg = _("Model error: {error}").format(error=str(e))
-                    if hasattr(e, 'prediction') and e.prediction:
-                        if hasattr(e.prediction, 'logs') and e.prediction.logs:
-                            error_msg += f"\n{_('Logs')}: {e.prediction.logs}"
-                    return None, error_msg
-
-                except ReplicateError as e:
-                    return None, _("Replicate API error: {error}").format(
-                        error=str(e)
-                    )
+            image_file = io.BytesIO(image_bytes)
+            image_file.name = "image.png"
+
+            if not report(MSG_UPLOADING, PROGRESS_UPLOAD):
+                return None, MSG_CANCELLED
+
+            prediction = self._create_prediction(model_name, image_file)
+
+            error = self._wait_for_prediction(prediction, report, cancel_event)
+            if error:
+                return None, error
+
+            output = prediction.output
+            if isinstance(output, list):
+                output = output[0] if output else None
+
+            if not output:
+                return None, _("No output received from API")
+
+            if not report(MSG_DOWNLOADING, PROGRESS_DOWNLOAD):
+                return None, MSG_CANCELLED
+
+            loader = None
+            try:
+                for chunk in self._iter_output(output):
+                    if loader is None:
+                        loader = self._new_loader(chunk)
+                    loader.write(chunk)
+                    if not report(MSG_DOWNLOADING, PROGRESS_DOWNLOAD):
+                        return None, MSG_CANCELLED
+            finally:
+                pixbuf = self._close_loader(loader) if loader else None
+
+            if not loader:
+                return None, _("No image data in API response")
+
+            if not pixbuf:
+                return None, _("Failed to convert result to image")
+
+            report(MSG_COMPLETE, PROGRESS_COMPLETE)
+
+            return pixbuf, None
+
+        except ReplicateError as e:
+            return None, _("Replicate API error: {error}").format(
+                error=str(e)
+            )
 
         except Exception as e:
             return None, _("Unexpected error: {error}").format(
                 error=str(e))
 
-        finally:
-            if temp_path and os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except (OSError, FileNotFoundError):
-                    pass
+    def _create_prediction(self, model_name: str, image_file: io.BytesIO):
+        """
+        Start a prediction for the given model identifier
+
+        Args:
+            model_name (str): "owner/name" or "owner/name:version"
+            image_file (io.BytesIO): Image to upload
+
+        Returns:
+            Prediction: The created prediction
+        """
+        model, _sep, version = model_name.partition(":")
+        if version:
+            return self.client.predictions.create(
+                version=version, input={"image": image_file})
+        return self.client.predictions.create(
+            model=model, input={"image": image_file})
+
+    def _wait_for_prediction(
+        self,
+        prediction: Any,
+        report: Callable[[str, Optional[float]], bool],
+        cancel_event: Optional[threading.Event]
+    ) -> Optional[str]:
+        """
+        Poll a prediction until it finishes or is cancelled
+
+        Polls start at POLL_INTERVAL_INITIAL and back off to
+        POLL_INTERVAL_MAX, so fast models are picked up soon after they
+        finish without polling long-running ones at a high rate.
+
+        Args:
+            prediction: Prediction returned by _create_prediction
+            report (callable): Progress callback, see
+                remove_background_from_bytes
+            cancel_event (threading.Event, optional): Cancellation event
+
+        Returns:
+            str: Error message if the prediction did not succeed, else None
+        """
+        interval = POLL_INTERVAL_INITIAL
+        while prediction.status not in PREDICTION_FINISHED_STATUSES:
+            if not report(MSG_PROCESSING, PROGRESS_PROCESS):
+                self._cancel_prediction(prediction)
+                return MSG_CANCELLED
+
+            if cancel_event:
+                if cancel_event.wait(interval):
+                    self._cancel_prediction(prediction)
+                    return MSG_CANCELLED
+            else:
+                time.sleep(interval)
+
+            prediction.reload()
+            interval = min(interval * POLL_BACKOFF, POLL_INTERVAL_MAX)
+
+        if prediction.status == "canceled":
+            return MSG_CANCELLED
+
+        if prediction.status == "failed":
+            error_msg = _("Model error: {error}").format(
+                error=str(prediction.error))
+            logs = getattr(prediction, 'logs', None)
+            if logs:
+                error_msg += f"\n{_('Logs')}: {logs}"
+            return error_msg
+
+        return None
+
+    def _cancel_prediction(self, prediction: Any) -> None:
+        """Ask Replicate to stop a prediction that is no longer needed"""
+        try:
+            prediction.cancel()
+        except Exception as e:
+            print(f"Failed to cancel prediction: {e}")
+
+    def _warm_up_connection(self) -> None:
+        """
+        Open a keep-alive connection to Replicate ahead of the upload
+
+        Runs while the image is being encoded so the TLS handshake is
+        already done by the time the prediction is submitted.
+        """
+        try:
+            self.client.accounts.current()
+        except Exception as e:
+            print(f"Connection warm-up failed: {e}")
+
+    def _iter_output(self, output: Any) -> Iterator[bytes]:
+        """
+        Iterate over the result image data in large chunks
+
+        Result URLs are streamed through the shared download client with
+        RESULT_CHUNK_SIZE reads, instead of the transport's small default,
+        to cut down on per-chunk allocations and loader writes. Data URLs
+        are decoded in place, and any other output is iterated as is.
+
+        Args:
+            output: Prediction output, a URL or file output
+
+        Returns:
+            Iterator over chunks of image data
+        """
+        if isinstance(output, str):
+            url = output
+        else:
+            url = getattr(output, 'url', None)
+            if not isinstance(url, str):
+                yield from output
+                return
+
+        if url.startswith("data:"):
+            yield base64.b64decode(url.partition(",")[2])
+            return
+
+        with self.download_client.stream("GET", url) as response:
+            response.raise_for_status()
+            yield from response.iter_bytes(RESULT_CHUNK_SIZE)
+
+    def _new_loader(self, first_chunk: bytes) -> GdkPixbuf.PixbufLoader:
+        """
+        Create a loader for the result image
+
+        The models return PNG, so a PNG loader is created up front when the
+        data starts with the PNG signature to skip format sniffing. Other
+        formats fall back to the generic loader.
+
+        Args:
+            first_chunk (bytes): First chunk of the result image
 
-    def _bytes_to_pixbuf(self, image_bytes: bytes) -> \
+        Returns:
+            GdkPixbuf.PixbufLoader: Loader for the image data
+        """
+        if first_chunk.startswith(PNG_SIGNATURE):
+            return GdkPixbuf.PixbufLoader.new_with_type("png")
+        return GdkPixbuf.PixbufLoader()
+
+    def _close_loader(self, loader: GdkPixbuf.PixbufLoader) -> \
             Optional[GdkPixbuf.Pixbuf]:
         """
-        Convert image bytes to GdkPixbuf
+        Finish decoding streamed image data
+
+        GdkPixbuf decoding does not touch GTK, so this is safe to run on
+        the worker thread that received the data.
 
         Args:
-            image_bytes (bytes): Image data
+            loader (GdkPixbuf.PixbufLoader): Loader that has been fed the
+                image data
 
         Returns:
             GdkPixbuf.Pixbuf: Pixbuf object, or None if conversion failed
         """
         try:
-            loader = GdkPixbuf.PixbufLoader()
-            loader.write(image_bytes)
             loader.close()
 
             pixbuf = loader.get_pixbuf()
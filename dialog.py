@@ -68,9 +68,10 @@ class DreamBackgroundRemoverDialog(GimpUi.Dialog):
     def _initialize(self):
         """Initialize the dialog"""
         self.ui.build_interface(self)
-        self.events.connect_all_signals()
         self._update_source_info()
         self._load_settings()
+        self.events.connect_all_signals()
+        self.events.sync_ui_state()
 
     def _load_settings(self):
         """Load settings from config file"""
@@ -101,11 +102,10 @@ class DreamBackgroundRemoverDialog(GimpUi.Dialog):
     def _update_source_info(self):
         """Update the source image information display"""
         if self.ui.source_info_label and self.image and self.drawable:
-            layer_name = (self.drawable.get_name() if self.drawable
-                          else _("Current Layer"))
-            width = self.drawable.get_width()
-            height = self.drawable.get_height()
+            layer_name = self.events.layer_name or _("Current Layer")
             info_text = _("{name} ({width}×{height}px)").format(
-                name=layer_name, width=width, height=height
+                name=layer_name,
+                width=self.events.layer_width,
+                height=self.events.layer_height
             )
             self.ui.source_info_label.set_text(info_text)
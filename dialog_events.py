@@ -10,7 +10,9 @@ from gi.repository import Gtk, GLib
 
 from dialog_threads import DreamBackgroundRemoverThreads
 from i18n import _
-from settings import store_settings
+from settings import store_settings_in_background
+
+API_KEY_DEBOUNCE_MS = 100
 
 
 class DreamBackgroundRemoverEventHandler:
@@ -22,15 +24,20 @@ class DreamBackgroundRemoverEventHandler:
         self.image = image
         self.drawable = drawable
 
+        self.layer_name = drawable.get_name() if drawable else None
+        self.layer_width = drawable.get_width() if drawable else 0
+        self.layer_height = drawable.get_height() if drawable else 0
+
+        self._api_key_debounce_source = 0
+        self._current_model = None
+        self._current_mode = None
+
         self.threads = DreamBackgroundRemoverThreads(ui, image, drawable)
         self.threads.set_callbacks({
             'on_success': self.close_on_success,
             'on_error': self.show_error
         })
 
-        if self.ui.toggle_visibility_btn:
-            self.on_toggle_visibility(self.ui.toggle_visibility_btn)
-
         def after_init():
             if self.ui.api_key_entry:
                 self.ui.api_key_entry.select_region(0, 0)
@@ -38,6 +45,7 @@ class DreamBackgroundRemoverEventHandler:
                 self.ui.model_combo.grab_focus()
 
             self.update_remove_background_button_state()
+            return False
 
         GLib.idle_add(after_init)
 
@@ -47,9 +55,14 @@ class DreamBackgroundRemoverEventHandler:
 
     def connect_all_signals(self):
         """Connect all UI signals to handlers"""
+        self.dialog.connect("destroy", self.on_destroy)
+
         if self.ui.model_combo:
             self.ui.model_combo.connect("changed", self.on_model_changed)
 
+        if self.ui.file_mode_radio:
+            self.ui.file_mode_radio.connect("toggled", self.on_mode_changed)
+
         if self.ui.toggle_visibility_btn:
             self.ui.toggle_visibility_btn.connect("toggled",
                                                   self.on_toggle_visibility)
@@ -65,8 +78,10 @@ class DreamBackgroundRemoverEventHandler:
             self.ui.api_key_entry.connect("changed", self.on_api_key_changed)
 
     def on_api_key_changed(self, _entry):
-        """Handle API key changes"""
-        self.update_remove_background_button_state()
+        """Handle API key changes once typing or pasting settles"""
+        self._cancel_api_key_debounce()
+        self._api_key_debounce_source = GLib.timeout_add(
+            API_KEY_DEBOUNCE_MS, self._commit_api_key_state)
 
     def on_cancel(self, _button):
         """Handle cancel button click"""
@@ -75,13 +90,22 @@ class DreamBackgroundRemoverEventHandler:
         else:
             self.dialog.response(Gtk.ResponseType.CANCEL)
 
+    def on_destroy(self, _widget):
+        """Drop pending timers and the worker once the dialog is gone"""
+        self._cancel_api_key_debounce()
+        self.threads.shutdown()
+
     def on_model_changed(self, combo_box):
         """Handle model selection changes"""
         if not combo_box:
             return
 
-        current_model = self.dialog.get_current_model()
-        self.ui.update_model_description(current_model)
+        self._current_model = self.dialog.get_current_model()
+        self.ui.update_model_description(self._current_model)
+
+    def on_mode_changed(self, _radio):
+        """Handle output mode changes"""
+        self._current_mode = self.dialog.get_current_mode()
 
     def on_remove_background(self, _button):
         """Handle remove background button click"""
@@ -90,11 +114,14 @@ class DreamBackgroundRemoverEventHandler:
             self.show_error(_("Please enter your Replicate API key"))
             return
 
-        mode = self.dialog.get_current_mode()
-        model = self.dialog.get_current_model()
+        self._cancel_api_key_debounce()
+
+        mode = self._current_mode or self.dialog.get_current_mode()
+        model = self._current_model or self.dialog.get_current_model()
 
         api_key_visible = self.dialog.get_api_key_visible()
-        store_settings(api_key, mode, api_key_visible, model)
+        store_settings_in_background(
+            api_key, mode, api_key_visible, model)
 
         self.threads.start_background_removal_thread(api_key, mode, model)
 
@@ -113,10 +140,34 @@ class DreamBackgroundRemoverEventHandler:
         self.ui.hide_progress()
         self.ui.set_ui_enabled(True)
 
+    def sync_ui_state(self):
+        """Update dependent widgets once after settings are loaded"""
+        if self.ui.toggle_visibility_btn:
+            self.on_toggle_visibility(self.ui.toggle_visibility_btn)
+
+        if self.ui.model_combo:
+            self.on_model_changed(self.ui.model_combo)
+
+        if self.ui.file_mode_radio:
+            self.on_mode_changed(self.ui.file_mode_radio)
+
     def update_remove_background_button_state(self):
         """Update remove background button sensitivity based on input state"""
         if not self.ui.api_key_entry:
             return
 
-        api_key = self.ui.api_key_entry.get_text().strip()
-        self.ui.update_remove_background_button_state(api_key)
+        api_key = self.ui.api_key_entry.get_text()
+        has_api_key = bool(api_key) and not api_key.isspace()
+        self.ui.update_remove_background_button_state(has_api_key)
+
+    def _cancel_api_key_debounce(self):
+        """Remove a pending API key update so it cannot fire later"""
+        if self._api_key_debounce_source:
+            GLib.source_remove(self._api_key_debounce_source)
+            self._api_key_debounce_source = 0
+
+    def _commit_api_key_state(self):
+        """Apply the settled API key to the button state"""
+        self._api_key_debounce_source = 0
+        self.update_remove_background_button_state()
+        return False
@@ -9,11 +9,24 @@ Handles all GTK interface creation and layout
 import gi
 gi.require_version('Gtk', '3.0')
 
-from gi.repository import Gtk
+from gi.repository import GLib, Gtk
 
 from i18n import _
 from settings import AVAILABLE_MODELS, get_model_display_name
 
+MODEL_DESCRIPTIONS = {
+    "bria": _("Bria's Remove Background model - High Quality"),
+    "851-labs": _("851 Labs Background Remover - "
+                  "Fast and Inexpensive"),
+    "recraft-ai": _("Recraft Remove Background - Tuned for AI")
+}
+DEFAULT_MODEL_DESCRIPTION = _("Choose the AI model for background removal")
+PULSE_INTERVAL_MS = 100
+MODEL_ROWS = tuple(
+    (model_key, get_model_display_name(model_key))
+    for model_key in AVAILABLE_MODELS
+)
+
 
 class DreamBackgroundRemoverUI:
     """Handles all GTK UI creation and layout"""
@@ -36,6 +49,10 @@ class DreamBackgroundRemoverUI:
         self.status_label = None
         self.progress_bar = None
 
+        self._toggleable_widgets = ()
+        self._ui_enabled = None
+        self._pulse_source = 0
+
     def build_interface(self, parent_dialog):
         """Build the main plugin interface"""
         if not parent_dialog:
@@ -47,6 +64,7 @@ class DreamBackgroundRemoverUI:
         main_box.set_margin_start(16)
         main_box.set_margin_end(16)
 
+        main_box.freeze_child_notify()
         try:
             api_key_section = self._create_api_key_section()
             main_box.pack_start(api_key_section, False, False, 0)
@@ -66,12 +84,25 @@ class DreamBackgroundRemoverUI:
             status_section = self._create_status_section()
             main_box.pack_start(status_section, False, False, 0)
 
+            main_box.thaw_child_notify()
             parent_dialog.get_content_area().add(main_box)
+
+            self._toggleable_widgets = tuple(
+                widget for widget in (
+                    self.api_key_entry,
+                    self.toggle_visibility_btn,
+                    self.layer_mode_radio,
+                    self.file_mode_radio,
+                    self.model_combo,
+                    self.remove_background_btn
+                ) if widget
+            )
         except Exception as e:
             print(f"Error building interface: {e}")
 
     def hide_progress(self):
         """Hide progress display"""
+        self._stop_pulse()
         if self.progress_bar:
             self.progress_bar.set_visible(False)
         if self.status_label:
@@ -79,18 +110,14 @@ class DreamBackgroundRemoverUI:
 
     def set_ui_enabled(self, enabled=True):
         """Enable/disable UI controls"""
-        if self.api_key_entry:
-            self.api_key_entry.set_sensitive(enabled)
-        if self.toggle_visibility_btn:
-            self.toggle_visibility_btn.set_sensitive(enabled)
-        if self.layer_mode_radio:
-            self.layer_mode_radio.set_sensitive(enabled)
-        if self.file_mode_radio:
-            self.file_mode_radio.set_sensitive(enabled)
-        if self.model_combo:
-            self.model_combo.set_sensitive(enabled)
-        if self.remove_background_btn:
-            self.remove_background_btn.set_sensitive(enabled)
+        if enabled == self._ui_enabled:
+            return
+
+        self._ui_enabled = enabled
+        if enabled:
+            self._stop_pulse()
+        for widget in self._toggleable_widgets:
+            widget.set_sensitive(enabled)
 
     def toggle_api_key_visibility(self, button):
         """Toggle API key visibility and update button icon"""
@@ -109,24 +136,18 @@ class DreamBackgroundRemoverUI:
         if not self.model_description:
             return
 
-        model_descriptions = {
-            "bria": _("Bria's Remove Background model - High Quality"),
-            "851-labs": _("851 Labs Background Remover - "
-                          "Fast and Inexpensive"),
-            "recraft-ai": _("Recraft Remove Background - Tuned for AI")
-        }
-
-        description = model_descriptions.get(
-            model_key, _("Choose the AI model for background removal"))
+        description = MODEL_DESCRIPTIONS.get(
+            model_key, DEFAULT_MODEL_DESCRIPTION)
         markup = f'<small><i>{description}</i></small>'
         self.model_description.set_markup(markup)
 
-    def update_remove_background_button_state(self, api_key):
-        """Update remove background button sensitivity based on API key"""
+    def update_remove_background_button_state(self, has_api_key):
+        """Enable the remove background button only when a key is entered"""
         if not self.remove_background_btn:
             return
 
-        self.remove_background_btn.set_sensitive(bool(api_key))
+        if self.remove_background_btn.get_sensitive() != has_api_key:
+            self.remove_background_btn.set_sensitive(has_api_key)
 
     def update_status(self, message, percentage=None):
         """Update status display"""
@@ -135,11 +156,13 @@ class DreamBackgroundRemoverUI:
 
         if self.progress_bar:
             if percentage is not None:
+                self._stop_pulse()
                 self.progress_bar.set_fraction(percentage)
-                self.progress_bar.set_visible(True)
-            else:
+            elif not self._pulse_source:
                 self.progress_bar.pulse()
-                self.progress_bar.set_visible(True)
+                self._pulse_source = GLib.timeout_add(
+                    PULSE_INTERVAL_MS, self._pulse_tick)
+            self.progress_bar.set_visible(True)
 
     def _create_api_key_section(self):
         """Create API key input section"""
@@ -207,8 +230,7 @@ class DreamBackgroundRemoverUI:
         section_box.pack_start(title_label, False, False, 0)
 
         self.model_combo = Gtk.ComboBoxText()
-        for model_key in AVAILABLE_MODELS.keys():
-            display_name = get_model_display_name(model_key)
+        for model_key, display_name in MODEL_ROWS:
             self.model_combo.append(model_key, display_name)
 
         section_box.pack_start(self.model_combo, False, False, 0)
@@ -216,9 +238,7 @@ class DreamBackgroundRemoverUI:
         self.model_description = Gtk.Label()
         self.model_description.set_halign(Gtk.Align.START)
         self.model_description.set_line_wrap(True)
-        markup = (f'<small><i>'
-                  f'{_("Choose the AI model for background removal")}'
-                  f'</i></small>')
+        markup = f'<small><i>{DEFAULT_MODEL_DESCRIPTION}</i></small>'
         self.model_description.set_markup(markup)
         section_box.pack_start(self.model_description, False, False, 0)
 
@@ -278,6 +298,22 @@ class DreamBackgroundRemoverUI:
 
         self.progress_bar = Gtk.ProgressBar()
         self.progress_bar.set_visible(False)
+        self.progress_bar.connect("destroy", lambda _w: self._stop_pulse())
         section_box.pack_start(self.progress_bar, False, False, 0)
 
         return section_box
+
+    def _pulse_tick(self):
+        """Advance the indeterminate progress animation"""
+        if not self.progress_bar:
+            self._pulse_source = 0
+            return GLib.SOURCE_REMOVE
+
+        self.progress_bar.pulse()
+        return GLib.SOURCE_CONTINUE
+
+    def _stop_pulse(self):
+        """Stop the indeterminate progress animation if it is running"""
+        if self._pulse_source:
+            GLib.source_remove(self._pulse_source)
+            self._pulse_source = 0
@@ -6,15 +6,31 @@ Threading operations for Dream Background Remover dialog
 Handles all background AI processing and image operations
 """
 
+import queue
 import threading
+import time
 
 from gi.repository import GLib
 
-import integrator
-from api import ReplicateAPI
+from api import (
+    ReplicateAPI, MSG_CANCELLED, MSG_COMPLETE, MSG_PREPARING,
+    PROGRESS_PREPARE, WARM_UP_TIMEOUT
+)
 from i18n import _
+from integrator import (
+    create_new_image_with_layer, create_scaled_layer,
+    export_drawable_to_bytes
+)
 from settings import get_model_name
 
+STATUS_UPDATE_INTERVAL = 0.033
+WARM_UP_POLL_INTERVAL = 0.05
+
+MSG_CANCELLING = _("Cancelling...")
+MSG_CREATING_RESULT = _("Creating result...")
+LAYER_NAME_TEMPLATE = _("{original} (Background Removed)")
+DEFAULT_LAYER_NAME = _("Background Removed")
+
 
 class DreamBackgroundRemoverThreads:
     """Handles all background threading operations"""
@@ -28,12 +44,19 @@ class DreamBackgroundRemoverThreads:
         self.drawable = drawable
         self._callbacks = {}
         self._processing = False
-        self._cancel_requested = False
+        self._cancel_event = threading.Event()
+        self._last_status = None
+        self._last_status_time = 0.0
+        self._pending_status = None
+        self._status_lock = threading.Lock()
+        self._result_dispatched = False
+        self._jobs = queue.Queue()
+        self._worker = None
 
     def cancel_processing(self):
         """Request cancellation of current processing"""
-        self._cancel_requested = True
-        self.ui.update_status(_("Cancelling..."))
+        self._cancel_event.set()
+        self.ui.update_status(MSG_CANCELLING)
 
     def is_processing(self):
         """Check if background removal is currently processing"""
@@ -45,6 +68,13 @@ class DreamBackgroundRemoverThreads:
             raise ValueError("Callbacks must be a dictionary")
         self._callbacks = callbacks
 
+    def shutdown(self):
+        """Cancel any running removal and let the worker thread exit"""
+        self._cancel_event.set()
+        if self._worker:
+            self._jobs.put(None)
+            self._worker = None
+
     def start_background_removal_thread(self, api_key, mode, model):
         """Start background removal in background thread"""
         if not self.ui or self._processing:
@@ -55,70 +85,162 @@ class DreamBackgroundRemoverThreads:
             return
 
         self._processing = True
-        self._cancel_requested = False
+        self._cancel_event.clear()
+        self._last_status = None
+        self._result_dispatched = False
         self.ui.set_ui_enabled(False)
+        self.ui.update_status(MSG_PREPARING, PROGRESS_PREPARE)
+
+        GLib.idle_add(self._export_and_queue, api_key, mode, model)
 
-        thread = threading.Thread(
-            target=self._background_removal_worker,
-            args=(api_key, mode, model)
-        )
-        thread.daemon = True
-        thread.start()
+    def _export_and_queue(self, api_key, mode, model):
+        """Export the drawable on the main thread and queue the upload"""
+        if self._cancel_event.is_set():
+            self._handle_cancelled()
+            return False
+
+        try:
+            api = ReplicateAPI(api_key)
+            warm_up = api.start_warm_up()
+            image_bytes = export_drawable_to_bytes(self.drawable)
+            if not image_bytes:
+                self._handle_error(_("Failed to export image data"))
+                return False
 
-    def _background_removal_worker(self, api_key, mode, model):
+            if not self._worker:
+                self._worker = threading.Thread(target=self._run_jobs)
+                self._worker.daemon = True
+                self._worker.start()
+
+            self._jobs.put((api, mode, model, image_bytes, warm_up))
+
+        except (ImportError, ValueError) as e:
+            self._handle_error(str(e))
+        except Exception as e:
+            error_msg = _("Unexpected error during background removal: "
+                          "{error}").format(error=str(e))
+            self._handle_error(error_msg)
+
+        return False
+
+    def _run_jobs(self):
+        """Run queued background removals on the persistent worker"""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            self._background_removal_worker(*job)
+
+    def _background_removal_worker(self, api, mode, model, image_bytes,
+                                   warm_up):
         """Remove background in background thread"""
         try:
-            if self._cancel_requested:
-                GLib.idle_add(self._handle_cancelled)
+            if self._cancel_event.is_set():
+                self._dispatch_result(self._handle_cancelled)
                 return
 
-            api = ReplicateAPI(api_key)
             model_name = get_model_name(model)
 
             def progress_callback(message, percentage=None):
-                if self._cancel_requested:
+                if self._cancel_event.is_set():
                     return False
-                GLib.idle_add(self.ui.update_status, message, percentage)
+                if self._should_update_status(message, percentage):
+                    self._post_status(message, percentage)
                 return True
 
-            pixbuf, error = api.remove_background(
-                self.drawable, model_name, progress_callback
+            self._wait_for_warm_up(warm_up)
+            if self._cancel_event.is_set():
+                self._dispatch_result(self._handle_cancelled)
+                return
+
+            pixbuf, error = api.remove_background_from_bytes(
+                image_bytes, model_name, progress_callback,
+                self._cancel_event
             )
 
-            if self._cancel_requested:
-                GLib.idle_add(self._handle_cancelled)
+            if self._cancel_event.is_set():
+                self._dispatch_result(self._handle_cancelled)
                 return
 
             if error:
-                GLib.idle_add(self._handle_error, error)
+                self._dispatch_result(self._handle_error, error)
                 return
 
             if not pixbuf:
-                GLib.idle_add(self._handle_error, _("Failed to process image"))
+                self._dispatch_result(
+                    self._handle_error, _("Failed to process image"))
                 return
 
-            layer_name = self._generate_layer_name()
-            GLib.idle_add(self._handle_success, pixbuf, layer_name, mode)
+            self._dispatch_result(self._handle_success, pixbuf, mode)
 
         except (ImportError, ValueError) as e:
-            GLib.idle_add(self._handle_error, str(e))
+            self._dispatch_result(self._handle_error, str(e))
         except Exception as e:
             error_msg = _("Unexpected error during background removal: "
                           "{error}").format(error=str(e))
-            GLib.idle_add(self._handle_error, error_msg)
+            self._dispatch_result(self._handle_error, error_msg)
+
+    def _wait_for_warm_up(self, warm_up):
+        """Wait for the connection warm-up, giving up early on cancel"""
+        deadline = time.monotonic() + WARM_UP_TIMEOUT
+        while warm_up.is_alive() and not self._cancel_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            warm_up.join(min(remaining, WARM_UP_POLL_INTERVAL))
+
+    def _dispatch_result(self, handler, *args):
+        """Run a final result handler on the main loop ahead of redraws"""
+        if self._result_dispatched:
+            return
+
+        self._result_dispatched = True
+        # PyGObject accepts priority as a keyword; the stubs do not list it
+        GLib.idle_add(handler, *args,
+                      priority=GLib.PRIORITY_DEFAULT)  # type: ignore
+
+    def _post_status(self, message, percentage):
+        """Queue a status update, replacing one not yet shown"""
+        with self._status_lock:
+            needs_flush = self._pending_status is None
+            self._pending_status = (message, percentage)
+
+        if needs_flush:
+            GLib.idle_add(self._flush_status)
+
+    def _flush_status(self):
+        """Show the most recent queued status update"""
+        with self._status_lock:
+            status = self._pending_status
+            self._pending_status = None
+
+        if status and self._processing:
+            self.ui.update_status(*status)
+        return False
+
+    def _should_update_status(self, message, percentage):
+        """Check if a progress update is worth redrawing the UI for"""
+        now = time.monotonic()
+        status = (message, percentage)
+        if (status == self._last_status and
+                now - self._last_status_time < STATUS_UPDATE_INTERVAL):
+            return False
+
+        self._last_status = status
+        self._last_status_time = now
+        return True
 
     def _generate_layer_name(self):
         """Generate a name for the new layer"""
         if self.drawable:
             original_name = self.drawable.get_name()
-            return _("{original} (Background Removed)").format(
-                original=original_name)
-        return _("Background Removed")
+            return LAYER_NAME_TEMPLATE.format(original=original_name)
+        return DEFAULT_LAYER_NAME
 
     def _handle_cancelled(self):
         """Handle cancelled operation"""
         self._processing = False
-        self.ui.update_status(_("Operation cancelled"))
+        self.ui.update_status(MSG_CANCELLED)
         self.ui.set_ui_enabled(True)
 
     def _handle_error(self, error_message):
@@ -129,22 +251,20 @@ class DreamBackgroundRemoverThreads:
         if self._callbacks.get('on_error'):
             self._callbacks['on_error'](error_message)
 
-    def _handle_success(self, pixbuf, layer_name, mode):
+    def _handle_success(self, pixbuf, mode):
         """Handle successful background removal"""
         try:
-            self.ui.update_status(_("Creating result..."), 0.95)
+            self.ui.update_status(MSG_CREATING_RESULT, 0.95)
+
+            layer_name = self._generate_layer_name()
 
             if mode == "file":
-                result = integrator.create_new_image_with_layer(
-                    pixbuf, layer_name)
+                result = create_new_image_with_layer(pixbuf, layer_name)
             else:
-                result = integrator.create_scaled_layer(
-                    self.image, pixbuf, layer_name)
+                result = create_scaled_layer(self.image, pixbuf, layer_name)
 
             if result:
-                self.ui.update_status(
-                    _("Background removal complete!"), 1.0
-                )
+                self.ui.update_status(MSG_COMPLETE, 1.0)
             else:
                 self._handle_error(_("Failed to create result image/layer"))
                 return
@@ -6,13 +6,17 @@ GIMP integration functions for Dream Background Remover plugin
 Handles all GIMP-specific operations for background removal results
 """
 
+import contextlib
 import os
 import tempfile
 
-from gi.repository import GdkPixbuf, Gimp, Gio
+from gi.repository import Gimp, Gio
 from i18n import _
 
 MAX_LAYER_NAME_LENGTH = 64
+PNG_EXPORT_PROCEDURE = "file-png-export"
+PNG_UPLOAD_COMPRESSION = 1
+SHARED_MEMORY_DIR = "/dev/shm"
 
 
 def create_new_image_with_layer(pixbuf, layer_name):
@@ -36,9 +40,6 @@ def create_new_image_with_layer(pixbuf, layer_name):
 
         image = Gimp.Image.new(width, height, Gimp.ImageBaseType.RGB)
 
-        if not pixbuf.get_has_alpha():
-            pixbuf = pixbuf.add_alpha(False, 0, 0, 0)
-
         layer = Gimp.Layer.new_from_pixbuf(
             image,
             _truncate_layer_name(layer_name),
@@ -50,10 +51,10 @@ def create_new_image_with_layer(pixbuf, layer_name):
         )
 
         image.insert_layer(layer, None, 0)
-        display = Gimp.Display.new(image)
+        if not layer.has_alpha():
+            layer.add_alpha()
 
-        if display:
-            Gimp.displays_flush()
+        Gimp.Display.new(image)
 
         print(f"Created new image with layer: {layer_name}")
         return image
@@ -87,16 +88,6 @@ def create_scaled_layer(image, pixbuf, layer_name):
     try:
         img_width = image.get_width()
         img_height = image.get_height()
-        pixbuf_width = pixbuf.get_width()
-        pixbuf_height = pixbuf.get_height()
-
-        if pixbuf_width != img_width or pixbuf_height != img_height:
-            pixbuf = pixbuf.scale_simple(
-                img_width, img_height, GdkPixbuf.InterpType.BILINEAR
-            )
-
-        if not pixbuf.get_has_alpha():
-            pixbuf = pixbuf.add_alpha(False, 0, 0, 0)
 
         new_layer = Gimp.Layer.new_from_pixbuf(
             image,
@@ -109,6 +100,13 @@ def create_scaled_layer(image, pixbuf, layer_name):
         )
 
         image.insert_layer(new_layer, None, 0)
+        if not new_layer.has_alpha():
+            new_layer.add_alpha()
+
+        if (new_layer.get_width() != img_width or
+                new_layer.get_height() != img_height):
+            new_layer.scale(img_width, img_height, False)
+
         image.set_selected_layers([new_layer])
 
         Gimp.displays_flush()
@@ -135,59 +133,193 @@ def export_drawable_to_bytes(drawable):
         print("No drawable provided for export")
         return None
 
-    duplicate = None
-    temp_path = None
-
     try:
         image = drawable.get_image()
         if not image:
             print("Drawable has no associated image")
             return None
 
-        duplicate = image.duplicate()
+        if _can_export_directly(image, drawable):
+            image_data = _save_to_bytes(image)
+        else:
+            with _owned_duplicate(image) as duplicate:
+                image_data = _save_to_bytes(duplicate)
+
+        if image_data is not None:
+            print(f"Exported drawable to {len(image_data)} bytes")
+        return image_data
+
+    except Exception as e:
+        print(f"Error exporting drawable: {e}")
+        return None
+
+
+def _can_export_directly(image, drawable):
+    """
+    Check if an image can be exported as is instead of a flattened copy
+
+    True when the drawable is the only layer and flattening would not
+    change its pixels: it covers the whole canvas at full opacity and
+    normal mode, with no alpha channel or mask. The PNG export procedure
+    must also exist, since Gimp.file_save would mark the original image
+    as exported.
+
+    Args:
+        image (Gimp.Image): Image that owns the drawable
+        drawable (Gimp.Drawable): Drawable being exported
+
+    Returns:
+        bool: True if the image can be exported without duplicating it
+    """
+    pdb = Gimp.get_pdb()
+    if not pdb or not pdb.procedure_exists(PNG_EXPORT_PROCEDURE):
+        return False
+
+    layers = image.get_layers()
+    if len(layers) != 1 or layers[0].get_id() != drawable.get_id():
+        return False
+
+    layer = layers[0]
+    _ok, offset_x, offset_y = layer.get_offsets()
+
+    return (
+        offset_x == 0 and offset_y == 0 and
+        layer.get_width() == image.get_width() and
+        layer.get_height() == image.get_height() and
+        layer.get_visible() and
+        not layer.has_alpha() and
+        not layer.get_mask() and
+        layer.get_opacity() == 100.0 and
+        layer.get_mode() == Gimp.LayerMode.NORMAL
+    )
+
+
+def _get_export_dirs():
+    """
+    Get directories to try for the temporary export file
+
+    GIMP can only export to a file, so the memory-backed /dev/shm is
+    tried first to keep the round trip off the disk. Containers often
+    mount it as a small tmpfs, so the system default follows as a
+    fallback for images that do not fit.
+
+    Returns:
+        tuple: Directory paths in order, None meaning the system default
+    """
+    if os.access(SHARED_MEMORY_DIR, os.W_OK):
+        return (SHARED_MEMORY_DIR, None)
+    return (None,)
+
+
+@contextlib.contextmanager
+def _owned_duplicate(image):
+    """
+    Flattened copy of an image that is deleted when the block exits
+
+    Args:
+        image (Gimp.Image): Image to duplicate
+
+    Yields:
+        Gimp.Image: Flattened duplicate of the image
+    """
+    duplicate = image.duplicate()
+    try:
         duplicate.flatten()
+        yield duplicate
+    finally:
+        duplicate.delete()
 
-        with tempfile.NamedTemporaryFile(
-            suffix='.png', delete=False
-        ) as temp_file:
-            temp_path = temp_file.name
 
-        temp_gfile = Gio.File.new_for_path(temp_path)
+def _save_png(image, gfile):
+    """
+    Save an image as a quickly encoded PNG for upload
 
-        success = Gimp.file_save(
-            Gimp.RunMode.NONINTERACTIVE,
-            duplicate,
-            temp_gfile,
-            None
-        )
+    Uses the PNG export procedure directly so a low compression level can
+    be requested, falling back to Gimp.file_save if it is unavailable.
+
+    Args:
+        image (Gimp.Image): Image to save
+        gfile (Gio.File): Destination file
+
+    Returns:
+        bool: True if the image was saved
+    """
+    pdb = Gimp.get_pdb()
+    procedure = pdb.lookup_procedure(PNG_EXPORT_PROCEDURE) if pdb else None
+    if not procedure:
+        return Gimp.file_save(
+            Gimp.RunMode.NONINTERACTIVE, image, gfile, None)
+
+    config = procedure.create_config()
+    config.set_property("run-mode", Gimp.RunMode.NONINTERACTIVE)
+    config.set_property("image", image)
+    config.set_property("file", gfile)
+    config.set_property("compression", PNG_UPLOAD_COMPRESSION)
+
+    result = procedure.run(config)
+    return result.index(0) == Gimp.PDBStatusType.SUCCESS
+
+
+def _save_to_bytes(image):
+    """
+    Save an image as PNG and read the encoded data back
+
+    Args:
+        image (Gimp.Image): Image to save
+
+    Returns:
+        bytes: PNG image data, or None if saving failed
+    """
+    for export_dir in _get_export_dirs():
+        try:
+            image_data = _save_to_temp_file(image, export_dir)
+        except OSError as e:
+            print(f"Failed to export to {export_dir or 'temp dir'}: {e}")
+            continue
+
+        if image_data is not None:
+            return image_data
 
-        if not success:
+    return None
+
+
+def _save_to_temp_file(image, export_dir):
+    """
+    Save an image as PNG to a temporary file and read it back
+
+    Args:
+        image (Gimp.Image): Image to save
+        export_dir (str): Directory for the file, or None for the default
+
+    Returns:
+        bytes: PNG image data, or None if saving failed
+    """
+    with tempfile.NamedTemporaryFile(
+        suffix='.png', delete=False, dir=export_dir
+    ) as temp_file:
+        temp_path = temp_file.name
+
+    try:
+        if not _save_png(image, Gio.File.new_for_path(temp_path)):
             print("Failed to save drawable to temporary file")
             return None
 
         with open(temp_path, 'rb') as f:
-            image_data = f.read()
-
-        print(f"Exported drawable to {len(image_data)} bytes")
-        return image_data
-
-    except Exception as e:
-        print(f"Error exporting drawable: {e}")
-        return None
+            return f.read()
     finally:
-        if duplicate:
-            duplicate.delete()
-        if temp_path:
-            try:
-                os.remove(temp_path)
-            except Exception:
-                pass
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
 
 
 def _truncate_layer_name(name):
     """
     Truncate layer name to fit GIMP's limitations
 
+    The limit is measured in UTF-8 bytes, and truncation never splits a
+    multi-byte character.
+
     Args:
         name (str): Original layer name
 
@@ -197,7 +329,9 @@ def _truncate_layer_name(name):
     if not name:
         return _("Background Removed")
 
-    if len(name) <= MAX_LAYER_NAME_LENGTH:
+    encoded = name.encode('utf-8')
+    if len(encoded) <= MAX_LAYER_NAME_LENGTH:
         return name
 
-    return name[:MAX_LAYER_NAME_LENGTH-3] + "..."
+    truncated = encoded[:MAX_LAYER_NAME_LENGTH-3]
+    return truncated.decode('utf-8', errors='ignore') + "..."
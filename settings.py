@@ -5,10 +5,13 @@
 Settings management for Dream Background Remover plugin
 """
 
+import functools
 import json
 import os
 import platform
-from typing import cast, Dict, Union, Literal
+import tempfile
+import threading
+from typing import cast, Dict, Optional, Tuple, Union, Literal
 
 from i18n import _
 
@@ -17,7 +20,6 @@ SettingsDict = Dict[str, Union[str, bool]]
 
 CONFIG_FILE_NAME = "dream-background-remover-config.json"
 GIMP_VERSION = "3.0"
-FILE_PERMISSIONS = 0o600
 
 AVAILABLE_MODELS = {
     "851-labs": ("851-labs/background-remover:"
@@ -42,7 +44,14 @@ DEFAULT_SETTINGS: SettingsDict = {
     "model": DEFAULT_MODEL
 }
 
+_settings_cache: Optional[Tuple[float, SettingsDict]] = None
+_settings_lock = threading.Lock()
+_pending_store: Optional[Tuple[str, str, bool, str]] = None
+_pending_lock = threading.Lock()
+_store_writer: Optional[threading.Thread] = None
 
+
+@functools.lru_cache(maxsize=None)
 def get_config_file() -> str:
     """Get path to config file in GIMP's user directory"""
     system = platform.system()
@@ -54,11 +63,7 @@ def get_config_file() -> str:
     else:
         gimp_dir = _get_linux_config_dir()
 
-    try:
-        os.makedirs(gimp_dir, exist_ok=True)
-    except (OSError, PermissionError) as e:
-        print(f"Warning: Could not create config directory {gimp_dir}: {e}")
-
+    _ensure_config_dir(gimp_dir)
     return os.path.join(gimp_dir, CONFIG_FILE_NAME)
 
 
@@ -91,12 +96,7 @@ def load_settings() -> SettingsDict:
     try:
         config_file = get_config_file()
         if os.path.exists(config_file):
-            with open(config_file, 'r', encoding='utf-8') as f:
-                loaded_settings = cast(SettingsDict, json.load(f))
-                for key, default_value in DEFAULT_SETTINGS.items():
-                    if key not in loaded_settings:
-                        loaded_settings[key] = default_value
-                return loaded_settings
+            return dict(_get_or_init_settings(config_file))
     except (OSError, PermissionError) as e:
         print(f"Failed to read settings file: {e}")
     except json.JSONDecodeError as e:
@@ -110,6 +110,8 @@ def load_settings() -> SettingsDict:
 def store_settings(api_key: str, mode: str, api_key_visible: bool,
                    model: str = DEFAULT_MODEL) -> None:
     """Store settings to config file"""
+    global _settings_cache
+
     if mode not in ("layer", "file"):
         raise ValueError(f"Invalid mode: {mode}. Must be 'layer' or 'file'")
 
@@ -120,17 +122,16 @@ def store_settings(api_key: str, mode: str, api_key_visible: bool,
 
     try:
         config_file = get_config_file()
-        settings = {
+        settings: SettingsDict = {
             "api_key": api_key,
             "mode": mode,
             "api_key_visible": api_key_visible,
             "model": model
         }
 
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(settings, f, indent=2)
-
-        os.chmod(config_file, FILE_PERMISSIONS)
+        with _settings_lock:
+            _write_settings_file(config_file, settings)
+            _settings_cache = (os.path.getmtime(config_file), dict(settings))
 
     except (OSError, PermissionError) as e:
         print(f"Failed to store settings: {e}")
@@ -140,6 +141,89 @@ def store_settings(api_key: str, mode: str, api_key_visible: bool,
         print(f"Unexpected error storing settings: {e}")
 
 
+def store_settings_in_background(api_key: str, mode: str,
+                                 api_key_visible: bool,
+                                 model: str = DEFAULT_MODEL) -> None:
+    """
+    Store settings on a single writer thread
+
+    Only the latest values are kept while a write is in progress, so
+    quick successive calls cannot land on disk out of order.
+    """
+    global _pending_store, _store_writer
+
+    with _pending_lock:
+        _pending_store = (api_key, mode, api_key_visible, model)
+        if _store_writer is None:
+            _store_writer = threading.Thread(target=_drain_pending_store)
+            _store_writer.start()
+
+
+def _drain_pending_store() -> None:
+    """Write pending settings until no newer values are waiting"""
+    global _pending_store, _store_writer
+
+    while True:
+        with _pending_lock:
+            pending = _pending_store
+            _pending_store = None
+            if pending is None:
+                _store_writer = None
+                return
+
+        try:
+            store_settings(*pending)
+        except Exception as e:
+            print(f"Unexpected error storing settings: {e}")
+
+
+def _ensure_config_dir(gimp_dir: str) -> None:
+    """Create the config directory if it does not exist yet"""
+    try:
+        os.makedirs(gimp_dir, exist_ok=True)
+    except (OSError, PermissionError) as e:
+        print(f"Warning: Could not create config directory {gimp_dir}: {e}")
+
+
+def _get_or_init_settings(config_file: str) -> SettingsDict:
+    """Get settings from memory, reading the file only when it changed"""
+    global _settings_cache
+
+    with _settings_lock:
+        mtime = os.path.getmtime(config_file)
+        if _settings_cache is None or _settings_cache[0] != mtime:
+            _settings_cache = (mtime, _read_settings(config_file))
+        return _settings_cache[1]
+
+
+def _read_settings(config_file: str) -> SettingsDict:
+    """Read and parse the config file"""
+    with open(config_file, 'rb') as f:
+        loaded_settings = cast(SettingsDict, json.loads(f.read()))
+    return {**DEFAULT_SETTINGS, **loaded_settings}
+
+
+def _write_settings_file(config_file: str, settings: SettingsDict) -> None:
+    """
+    Write settings atomically so a crash cannot leave a partial file
+
+    mkstemp creates the file readable and writable by the owner only, so
+    the API key is never exposed while the file is being written.
+    """
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(config_file), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(settings, f, separators=(',', ':'), ensure_ascii=False)
+        os.replace(temp_path, config_file)
+    except Exception:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
 def _get_linux_config_dir() -> str:
     """Get Linux config directory"""
     return os.path.join(os.path.expanduser("~"), '.config', 'GIMP',